@@ -0,0 +1,200 @@
+"""
+Render benchmark of the screens of the beads task (beadtask package).
+
+BeadsTask is built against a hidden window, and each screen of run_trial is drawn N times (into the back buffer,
+which is cleared after every draw, so vsync never throttles the loop), after a few untimed warm-up draws (such that
+one-off glyph and texture uploads are not counted). Per draw it records:
+    - cpu:  CPU time of the Python/PsychoPy draw calls
+    - gl:   the time from the end of the draw calls until the GL pipeline has finished them (glFinish)
+    - wall: total wall time of the draw, including the glFinish
+and per screen the peak Python memory allocated while drawing (tracemalloc), measured in a separate pass, since
+tracing every allocation would slow down the timed draws.
+
+The results can be saved as a baseline file, and later runs compared against it, e.g. on CI:
+    python BenchmarkScreens.py --save render_baseline.json
+    python BenchmarkScreens.py --compare render_baseline.json --tolerance 0.2
+
+On a machine without a display, run it through a virtual framebuffer, e.g. 'xvfb-run -a python BenchmarkScreens.py'
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pyglet.gl as GL
+from psychopy import visual
+
+from beadtask import TrialRecord, SEQUENCES
+from beadtask.task import BeadsTask
+
+
+# -------------------
+# Timing
+# -------------------
+def time_screen(win, draw, n, warmup=5, reset=None):
+    """Draw a screen n times (after 'warmup' untimed draws), returning the per-draw timings (in ms).
+       reset (if given) is called after every draw, outside the timing, to undo state changes of the draw
+    """
+    for _ in range(warmup):
+        draw()
+        GL.glFinish()
+        win.clearBuffer()
+        if reset is not None:
+            reset()
+
+    cpu, gl, wall = np.empty(n), np.empty(n), np.empty(n)
+    for i in range(n):
+        c0, w0 = time.process_time(), time.perf_counter()
+        draw()
+        c1, w1 = time.process_time(), time.perf_counter()
+        GL.glFinish()
+        w2 = time.perf_counter()
+        win.clearBuffer()
+        cpu[i], gl[i], wall[i] = c1 - c0, w2 - w1, w2 - w0
+        if reset is not None:
+            reset()
+
+    summary = {}
+    for name, times in [('cpu', cpu), ('gl', gl), ('wall', wall)]:
+        summary[f'{name}_ms_median'] = float(np.median(times) * 1000)
+        summary[f'{name}_ms_p95'] = float(np.percentile(times, 95) * 1000)
+    return summary
+
+
+def peak_memory(win, draw, n, reset=None):
+    """Peak Python memory (in KB) allocated while drawing a screen n times (tracemalloc must be tracing)"""
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    for _ in range(n):
+        draw()
+        win.clearBuffer()
+        if reset is not None:
+            reset()
+    return (tracemalloc.get_traced_memory()[1] - start_memory) / 1024
+
+
+# -------------------
+# Screens
+# -------------------
+def screens(exp):
+    """The screens of run_trial, as (name, draw function, reset function or None) triples"""
+    trials = {}
+    for display in [True, False]:
+        trial = TrialRecord('blue', display, 60, SEQUENCES[60][2], 0.0, box_seed=1)
+        for _ in range(9):
+            trial.add_estimate(0.5)
+        trials[display] = trial
+
+    label_list = exp.draw_ratio_labels(60)
+    list_of_box_objects = exp.draw_boxes(60, box_seed=1)
+    capture_rect = exp.boxes_capture_rect(list_of_box_objects + label_list)
+    static_stim = visual.BufferImageStim(exp.win, stim=list_of_box_objects + label_list, rect=capture_rect)
+    exp.win.clearBuffer()
+
+    def draw_boxes():
+        for object in (label_list + list_of_box_objects):
+            object.draw()
+
+    def capture_boxes():
+        # The capture of run_trial / prepare_trial_boxes (only the area of the boxes and labels)
+        visual.BufferImageStim(exp.win, stim=list_of_box_objects + label_list, rect=capture_rect)
+
+    def draw_choice_highlight():
+        exp.draw_final_choice_screen(static_stim, list_of_box_objects, trials[True], 'blue')
+
+    # The highlight turns the chosen frame yellow; only the frame colors are restored (untimed) between draws
+    frame_colors = (exp.green_frame.lineColor, exp.blue_frame.lineColor)
+
+    def reset_frame_colors():
+        exp.green_frame.lineColor, exp.blue_frame.lineColor = frame_colors
+
+    bead_stim = exp.bead_circles['blue']
+    mid_rise = exp.bead_rise_y[len(exp.bead_rise_y) // 2]
+
+    return [
+        ('boxes (draw_boxes, 200 circles)', draw_boxes, None),
+        ('boxes BufferImageStim capture', capture_boxes, None),
+        ('prior slider', lambda: exp.draw_rating_screen(static_stim, exp.prior_text, 0.5), None),
+        ('slider + visual record', lambda: exp.draw_rating_screen(static_stim, exp.est_prob_text, 0.5, trials[True], 8), None),
+        ('slider + numeric record', lambda: exp.draw_rating_screen(static_stim, exp.est_prob_text, 0.5, trials[False], 8), None),
+        ('bead rise frame', lambda: exp.draw_bead_rise_frame(bead_stim, mid_rise), None),
+        ('final choice', lambda: exp.draw_final_choice_screen(static_stim, list_of_box_objects, trials[True]), None),
+        ('final choice highlight', draw_choice_highlight, reset_frame_colors),
+    ]
+
+
+def run_benchmark(n, size):
+    win = visual.Window(size=size, fullscr=False, visible=False, color="grey", waitBlanking=False)
+    exp = BeadsTask(win, 'benchmark', seed=1, frame_rate=60.0)
+
+    # Timings with tracing off, then the memory in a separate (traced) pass over the same screens
+    screen_list = screens(exp)
+    results = {name: time_screen(win, draw, n, reset=reset) for name, draw, reset in screen_list}
+    tracemalloc.start()
+    for name, draw, reset in screen_list:
+        results[name]['py_peak_kb'] = peak_memory(win, draw, min(n, 20), reset=reset)
+    tracemalloc.stop()
+
+    gl_renderer = GL.glGetString(GL.GL_RENDERER)
+    win.close()
+
+    return {
+        'machine': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'gl_renderer': gl_renderer.decode() if isinstance(gl_renderer, bytes) else str(gl_renderer),
+            'window_size': list(size),
+            'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        },
+        'draws_per_screen': n,
+        'screens': results
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of each screen's median wall time against the baseline. Returns the regressed screens"""
+    regressions = []
+    print(f"{'screen':<35}{'baseline ms':>12}{'now ms':>10}{'change':>10}")
+    for name, summary in results['screens'].items():
+        if name not in baseline['screens']:
+            print(f"{name:<35}{'-':>12}{summary['wall_ms_median']:>10.3f}{'new':>10}")
+            continue
+        before = baseline['screens'][name]['wall_ms_median']
+        now = summary['wall_ms_median']
+        change = now / before - 1 if before > 0 else 0.0
+        flag = '  REGRESSION' if change > tolerance else ''
+        print(f"{name:<35}{before:>12.3f}{now:>10.3f}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+# -------------------
+# Run everything
+# -------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the drawing of each screen of the beads task offscreen")
+    parser.add_argument("-n", type=int, default=200, help="draws per screen")
+    parser.add_argument("--size", type=int, nargs=2, default=[1920, 1080], help="window size (width height)")
+    parser.add_argument("--save", help="save the results as a baseline file")
+    parser.add_argument("--compare", help="compare the results against a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative increase of median wall time")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.n, args.size)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+    else:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,117 @@
+"""
+Console monitor of running sessions of the beads task (beadtask package).
+
+Each station running the task publishes its progress (trial start, ratings, choices, breaks) to this monitor when
+the task is run with '--monitor HOST:PORT' (or MONITOR_ADDRESS in beadtask/constants.py is set), HOST:PORT being the
+address of the machine running the monitor. The monitor listens for these events from any number of stations, and shows
+one line per station: the current trial, the last event and how long ago it was, and the accuracy of the main trials
+so far. Stations with no event for a while are flagged (on a break: for a while after the break should have ended).
+
+Usage:
+    python MonitorSession.py                    # listen on port 50500
+    python MonitorSession.py --port 50500 --stuck 45
+"""
+import argparse
+import json
+import os
+import select
+import socket
+import time
+
+
+# -------------------
+# Session state
+# -------------------
+class StationState:
+    """What is known of the session running on a station, updated from its events"""
+
+    def __init__(self, station):
+        self.station = station
+        self.subject = None
+        self.trial = None
+        self.practice = False
+        self.last_event = None
+        self.last_time = None
+        self.last_rating = None
+        self.choices = 0
+        self.correct = 0
+        self.break_length = None  # length (s) of the current break, None: not on a break
+        self.dropped = 0
+
+    def update(self, message):
+        event = message['event']
+        self.subject = message.get('subject', self.subject)
+        self.last_event = event
+        self.last_time = time.time()
+        self.dropped = message.get('dropped', self.dropped)
+        self.break_length = None
+
+        if event == 'trial_start':
+            self.trial = message['trial']
+            self.practice = message['practice']
+            self.last_rating = None
+        elif event == 'rating':
+            self.last_rating = message['rating']
+        elif event == 'choice' and not message['practice']:
+            self.choices += 1
+            self.correct += int(message['correct'])
+        elif event == 'break':
+            # On a break until the next event (normally 'break_end'), which is only expected after the whole break
+            self.break_length = message['duration']
+        elif event == 'session_start':
+            self.trial, self.choices, self.correct = None, 0, 0
+
+    def status(self, stuck_after):
+        """The station's line of the monitor"""
+        since = time.time() - self.last_time
+        trial = '-' if self.trial is None else f"{'P' if self.practice else ''}{self.trial}"
+        rating = '-' if self.last_rating is None else f"{self.last_rating:.2f}"
+        accuracy = '-' if self.choices == 0 else f"{self.correct / self.choices:.0%} ({self.correct}/{self.choices})"
+
+        if self.last_event == 'session_end':
+            flag = 'done'
+        elif self.break_length is not None:
+            flag = 'STUCK?' if since > self.break_length + stuck_after else 'break'
+        elif since > stuck_after:
+            flag = 'STUCK?'
+        else:
+            flag = ''
+        return (f"{self.station:<20}{str(self.subject):<10}{trial:>7}  {self.last_event:<15}{since:>7.0f}s"
+                f"{rating:>8}  {accuracy:<16}{self.dropped:>8}  {flag}")
+
+
+def show(stations, stuck_after):
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print(f"{'station':<20}{'subject':<10}{'trial':>7}  {'last event':<15}{'ago':>8}{'rating':>8}  {'accuracy':<16}{'dropped':>8}")
+    for station in sorted(stations):
+        print(stations[station].status(stuck_after))
+
+
+# -------------------
+# Run everything
+# -------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the progress of running beads task sessions")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=50500, help="port to listen on (as in MONITOR_ADDRESS)")
+    parser.add_argument("--stuck", type=float, default=60.0, help="seconds without events after which a station is flagged")
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((args.host, args.port))
+
+    stations = {}
+    print(f"Listening on {args.host}:{args.port}")
+    while True:
+        # Redraw on every event, and at least once a second (to update the times since the last events)
+        readable, _, _ = select.select([sock], [], [], 1.0)
+        if readable:
+            data, _ = sock.recvfrom(65536)
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            station = message.get('station', '?')
+            stations.setdefault(station, StationState(station)).update(message)
+        if stations:
+            show(stations, args.stuck)
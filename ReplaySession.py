@@ -0,0 +1,163 @@
+"""
+Offscreen replay of a recorded session of the beads task (beadtask package).
+
+Every screen shown by BeadsTask.run_trial is re-rendered, in a hidden window, from a session's results file
+(beads_task_results_<subject>.csv) and session file (beads_task_session_<subject>.json, holding the seed and the
+per-trial box arrangements). Nothing waits for the clock or for input, so a session replays much faster than it ran.
+
+Every frame is written as soon as it is captured (nothing is collected in memory), per trial, either:
+    - as an image sequence: one image per screen, with the bead-rise animation subsampled to a few frames, plus a
+      'screens.csv' index with the duration each image stands for, or
+    - as a video (--video): every animation frame, with each screen held for its duration.
+Screens that wait for the participant (the ratings and the final choice) are held for a fixed time (--hold).
+
+Usage:
+    python ReplaySession.py "participant data/beads_task_results_030.csv" beads_task_session_030.json replay_030
+    python ReplaySession.py <results.csv> <session.json> <output folder> --video --hold 1.5
+
+On a machine without a display, run it through a virtual framebuffer, e.g. 'xvfb-run -a python ReplaySession.py ...'
+"""
+import argparse
+import csv
+import os
+
+import imageio
+import numpy as np
+from psychopy import visual
+
+from beadtask import load_session
+from beadtask.task import BeadsTask
+
+
+# -------------------
+# Replay
+# -------------------
+class ReplayTask(BeadsTask):
+    """BeadsTask drawing the screens of recorded trials into a hidden window, capturing each screen instead of showing it"""
+
+    def __init__(self, win, session, trials, video=False, hold=1.0, rise_frames=3):
+        super().__init__(win, session['Subject'], seed=session['Seed'], frame_rate=session['FrameRate'])
+        self.trials = trials
+        self.video = video
+        self.hold = hold  # duration (s) of the screens waiting for the participant
+        self.rise_frames = rise_frames  # frames of the bead-rise animation in an image sequence
+        self.screens = []
+        self.trial_frames = 0
+        self.trial_dir = None  # image sequence: folder of the current trial
+        self.writer = None  # video: writer of the current trial
+
+    def capture(self, trial_num, screen, duration):
+        """Capture the drawn (back) buffer as a frame, and write it right away (in video mode, repeated for the duration of the screen)"""
+        frame = self.win.getMovieFrame(buffer='back')
+        self.win.movieFrames.pop()  # getMovieFrame also keeps the frame; it is written here instead
+        self.trial_frames += 1
+        if self.video:
+            image = np.asarray(frame)
+            for _ in range(max(1, int(round(duration * self.frame_rate)))):
+                self.writer.append_data(image)
+        else:
+            frame.save(os.path.join(self.trial_dir, f"frame_{self.trial_frames:04d}.png"))
+        self.screens.append([trial_num, self.trial_frames, screen, duration])
+        self.win.clearBuffer()
+
+    def rise_frame_indices(self):
+        """The frames of the bead-rise animation to capture, and the duration each stands for (all frames in video mode)"""
+        n_frames = len(self.bead_rise_y)
+        if self.video or self.rise_frames >= n_frames:
+            indices = list(range(n_frames))
+        else:
+            indices = [k * n_frames // self.rise_frames for k in range(self.rise_frames)]  # the starts of equal segments
+        ends = indices[1:] + [n_frames]
+        return [(idx, (end - idx) * self.frame_duration) for idx, end in zip(indices, ends)]
+
+    def replay_trial(self, trial_num):
+        """Draw every screen of run_trial for a recorded trial (without flipping, waiting or collecting input)"""
+        trial = self.trials[trial_num]
+        self.trial_frames = 0
+
+        # Trial start: the two boxes close together
+        label_list = self.draw_ratio_labels(trial.ratio)
+        list_of_box_objects = self.draw_boxes(trial.ratio, trial.box_seed)
+        self.move_boxes(label_list + list_of_box_objects, self.box_displacement)
+        for object in (label_list + list_of_box_objects):
+            object.draw()
+        self.capture(trial_num, 'trial start', 3.0)
+        self.capture(trial_num, 'blank', 0.5)
+
+        self.move_boxes(label_list + list_of_box_objects, -self.box_displacement)
+        static_stim = visual.BufferImageStim(self.win, stim=list_of_box_objects + label_list,
+                                             rect=self.boxes_capture_rect(list_of_box_objects + label_list))
+        self.win.clearBuffer()
+
+        # Prior rating, with the marker bar at the recorded rating
+        self.slider.reset()
+        self.draw_rating_screen(static_stim, self.prior_text, trial.prob_estimates[0])
+        self.capture(trial_num, 'rating 0', self.hold)
+
+        minority_color = 'green' if trial.hidden_color == 'blue' else 'blue'
+        for idx, bead in enumerate(trial.sequence):
+            self.question_box.draw()
+            self.question_text.draw()
+            self.capture(trial_num, f'question box {idx + 1}', self.frame_duration)
+
+            bead_stim = self.bead_circles[trial.hidden_color if bead == 1 else minority_color]
+            for frame_idx, duration in self.rise_frame_indices():
+                self.draw_bead_rise_frame(bead_stim, self.bead_rise_y[frame_idx])
+                self.capture(trial_num, f'bead rise {idx + 1}', duration)
+
+            self.draw_bead_hold_frame(bead_stim)
+            self.capture(trial_num, f'bead hold {idx + 1}', 0.3)
+
+            self.slider.reset()
+            self.draw_rating_screen(static_stim, self.est_prob_text, trial.prob_estimates[idx + 1], trial, idx + 1)
+            self.capture(trial_num, f'rating {idx + 1}', self.hold)
+
+        # Final choice, before and after the choice was made
+        self.draw_final_choice_screen(static_stim, list_of_box_objects, trial)
+        self.capture(trial_num, 'final choice', self.hold)
+        if trial.final_choice in ['green', 'blue']:
+            self.draw_final_choice_screen(static_stim, list_of_box_objects, trial, trial.final_choice)
+            self.capture(trial_num, 'chosen box', 0.3)
+        self.capture(trial_num, 'blank', 0.5)
+
+    def replay(self, out_dir):
+        """Replay all trials, writing the frames of each trial to its own video / image folder"""
+        os.makedirs(out_dir, exist_ok=True)
+        for trial_num in range(len(self.trials)):
+            if self.video:
+                self.writer = imageio.get_writer(os.path.join(out_dir, f"trial_{trial_num + 1:02d}.mp4"), fps=self.frame_rate)
+                try:
+                    self.replay_trial(trial_num)
+                finally:
+                    self.writer.close()
+            else:
+                self.trial_dir = os.path.join(out_dir, f"trial_{trial_num + 1:02d}")
+                os.makedirs(self.trial_dir, exist_ok=True)
+                self.replay_trial(trial_num)
+
+        with open(os.path.join(out_dir, "screens.csv"), "w", newline="") as f:
+            writer = csv.writer(f, delimiter=",")
+            writer.writerow(['Trial', 'Frame', 'Screen', 'Duration'])
+            for trial_num, frame, screen, duration in self.screens:
+                writer.writerow([trial_num + 1, frame, screen, duration])
+
+
+# -------------------
+# Run everything
+# -------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-render every screen of a recorded beads task session offscreen")
+    parser.add_argument("results_file", help="beads_task_results_<subject>.csv")
+    parser.add_argument("session_file", help="beads_task_session_<subject>.json")
+    parser.add_argument("out_dir", help="folder to write the frames to")
+    parser.add_argument("--video", action="store_true", help="write one video per trial instead of an image sequence")
+    parser.add_argument("--hold", type=float, default=1.0, help="seconds to show each rating and the final choice screen")
+    parser.add_argument("--rise-frames", type=int, default=3, help="frames of each bead-rise animation in an image sequence")
+    args = parser.parse_args()
+
+    session, trials = load_session(args.results_file, args.session_file)
+
+    # Same size as the session's window (such that the destretched layout is identical), but hidden and not synced to the screen
+    win = visual.Window(size=session['WindowSize'], fullscr=False, visible=False, color="grey", waitBlanking=False)
+    ReplayTask(win, session, trials, video=args.video, hold=args.hold, rise_frames=args.rise_frames).replay(args.out_dir)
+    win.close()
@@ -0,0 +1,29 @@
+"""
+The beads task.
+
+Importing the package (the constants, trial records and generation, and the session files' schema) doesn't import
+PsychoPy, so analysis and simulation tools start instantly. The rendering layer (beadtask.task) is only loaded when
+BeadsTask is first used, e.g. when a session is run (python BeadTask.py, or python -m beadtask).
+"""
+from .constants import (RATIO_MAP, SEQUENCES, BLOCK_ORDER, COLORS, N_BEADS, WEIGHTS,
+                        ADAPTIVE_DESIGN, MONITOR_ADDRESS, REALTIME_MODE)
+from .trials import TrialRecord, evidence_asymmetry, generate_trials, generate_practice_trials
+from .schema import RESULTS_COLUMNS, write_results, write_session, load_session, session_filename
+
+# Loaded on first use (numpy / PsychoPy)
+_LAZY = {
+    'BeadsTask': 'task',
+    'collect_subject_number': 'task',
+    'destretch_stimuli': 'task',
+    'AdaptiveDesign': 'adaptive',
+    'simulate_beliefs_grid': 'adaptive',
+    'RealTimeControl': 'realtime',
+    'MonitorFeed': 'monitor',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
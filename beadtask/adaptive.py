@@ -0,0 +1,149 @@
+"""Adaptive design of the beads task (no PsychoPy needed)"""
+import math
+
+import numpy as np
+
+from .constants import RATIO_MAP, SEQUENCES
+
+
+# -------------------
+# Adaptive design
+# -------------------
+def simulate_beliefs_grid(sequence, ratio, omega1, omega2, subject_prior=0.5, eps=1e-6):
+    """
+    Vectorized port of simulate_beliefs from "Modelling Base Rate Neglect.Rmd".
+    Simulates the belief trajectory (probability of the hidden box) for a bead sequence
+    for every (omega1, omega2) pair at once.
+
+    Parameters
+    ----------
+    sequence : list
+        The 8 beads of the trial (1 = majority/hidden-box color, 0 = minority color)
+    ratio : int
+        The bead ratio of the trial (60 or 90)
+    omega1, omega2 : numpy.ndarray
+        Prior- and likelihood-weights (broadcastable against each other)
+    subject_prior : float
+        The participant's prior estimate for the hidden box (first slider rating)
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape broadcast(omega1, omega2).shape + (9,), the first entry along
+        the last axis always being the subject prior
+    """
+    omega1, omega2 = np.broadcast_arrays(np.asarray(omega1, dtype=float), np.asarray(omega2, dtype=float))
+    majority = RATIO_MAP[ratio][0] / 100
+    likelihood_logits = {1: math.log(majority / (1 - majority)), 0: math.log((1 - majority) / majority)}
+
+    prior = min(max(subject_prior, eps), 1 - eps)
+    logit_prior = np.full(omega1.shape, math.log(prior / (1 - prior)))
+
+    beliefs = np.empty(omega1.shape + (len(sequence) + 1,))
+    beliefs[..., 0] = subject_prior
+    for d, bead in enumerate(sequence):
+        logit_prior = omega1 * logit_prior + omega2 * likelihood_logits[bead]
+        with np.errstate(over='ignore'):  # very large logits (omega1 > 1) simply saturate at 0 or 1
+            beliefs[..., d + 1] = 1 / (1 + np.exp(-logit_prior))
+    return beliefs
+
+
+class AdaptiveDesign:
+    """
+    Bayesian adaptive design over the parameters of model M12 (omega1, omega2_60, omega2_90).
+
+    The posterior lives on a 3D grid. The predicted belief trajectories of every candidate
+    (ratio, sequence) pair are precomputed once for the 2D (omega1, omega2) grid, so choosing
+    the next trial only takes a few vectorized reductions: for each candidate, the expected
+    information gain is approximated by 0.5 * log det(I + Cov[predictions] / rating_sd^2),
+    with the covariance taken over the current posterior (linear-Gaussian approximation).
+
+    Candidates are drawn without replacement, so a full run reproduces the 32 trials of the
+    fixed design, only in a different order. Selection stops once the posterior SD of all
+    three parameters falls below target_sd (after at least min_trials trials).
+    """
+
+    def __init__(self, omega_grid=None, rating_sd=0.1, target_sd=0.1, min_trials=8, max_trials=32):
+        self.omega_grid = np.linspace(0, 2, 31) if omega_grid is None else np.asarray(omega_grid, dtype=float)
+        self.rating_sd = rating_sd
+        self.target_sd = target_sd
+        self.min_trials = min_trials
+        self.max_trials = max_trials
+
+        # Precompute the likelihood tables: predicted estimates after bead 1-8 (the prior is excluded,
+        # as in objective_fn) for every sequence and (omega1, omega2) grid point, with a neutral prior
+        self.omega1_mesh, self.omega2_mesh = np.meshgrid(self.omega_grid, self.omega_grid, indexing='ij')
+        self.pred_tables = {
+            ratio: np.stack([
+                simulate_beliefs_grid(seq, ratio, self.omega1_mesh, self.omega2_mesh)[..., 1:].reshape(-1, 8)
+                for seq in SEQUENCES[ratio]
+            ])
+            for ratio in SEQUENCES
+        }
+        self.reset()
+
+    def reset(self):
+        """Start over with a flat posterior and the full set of candidate trials"""
+        n = len(self.omega_grid)
+        self.log_posterior = np.zeros((n, n, n))  # axes: omega1, omega2_60, omega2_90
+        self.remaining = {ratio: list(range(len(SEQUENCES[ratio]))) for ratio in SEQUENCES}
+        self.n_trials = 0
+
+    def posterior(self):
+        post = np.exp(self.log_posterior - self.log_posterior.max())
+        return post / post.sum()
+
+    def posterior_summary(self):
+        """Posterior means and SDs of omega1, omega2_60 and omega2_90"""
+        post = self.posterior()
+        summary = {}
+        for name, axes in [('omega1', (1, 2)), ('omega2_60', (0, 2)), ('omega2_90', (0, 1))]:
+            marginal = post.sum(axis=axes)
+            mean = np.dot(marginal, self.omega_grid)
+            sd = math.sqrt(max(np.dot(marginal, (self.omega_grid - mean) ** 2), 0.0))
+            summary[name] = (mean, sd)
+        return summary
+
+    def should_stop(self):
+        if self.n_trials >= self.max_trials or not any(self.remaining.values()):
+            return True
+        if self.n_trials < self.min_trials:
+            return False
+        return all(sd < self.target_sd for _, sd in self.posterior_summary().values())
+
+    def select_next(self):
+        """Return the (ratio, sequence index) with the highest expected information gain"""
+        post = self.posterior()
+        best, best_gain = None, -np.inf
+        for ratio, sum_axis in [(60, 2), (90, 1)]:
+            if not self.remaining[ratio]:
+                continue
+            weights = post.sum(axis=sum_axis).ravel()  # marginal over (omega1, omega2_<ratio>)
+            preds = self.pred_tables[ratio][self.remaining[ratio]]  # (candidates, grid points, 8)
+            centered = preds - np.einsum('g,cgd->cd', weights, preds)[:, None, :]
+            cov = np.matmul((centered * weights[:, None]).transpose(0, 2, 1), centered)
+            _, logdet = np.linalg.slogdet(np.eye(8) + cov / self.rating_sd ** 2)
+            idx = int(np.argmax(logdet))
+            if logdet[idx] > best_gain:
+                best, best_gain = (ratio, self.remaining[ratio][idx]), logdet[idx]
+        return best
+
+    def update(self, ratio, seq_idx, estimates=None):
+        """
+        Update the posterior with a completed trial.
+        estimates are the 9 ratings normalized to the probability of the hidden box. If None (e.g. an
+        incorrect trial, which the fitting procedure excludes), the candidate is only marked as used.
+        """
+        self.remaining[ratio].remove(seq_idx)
+        self.n_trials += 1
+        if estimates is None:
+            return
+
+        # Recompute the trial's predictions from the participant's actual prior (only one trial, so this is cheap)
+        preds = simulate_beliefs_grid(SEQUENCES[ratio][seq_idx], ratio, self.omega1_mesh, self.omega2_mesh,
+                                      subject_prior=estimates[0])[..., 1:]
+        log_lik = -np.sum((preds - np.asarray(estimates[1:])) ** 2, axis=-1) / (2 * self.rating_sd ** 2)
+        if ratio == 60:
+            self.log_posterior += log_lik[:, :, None]
+        else:
+            self.log_posterior += log_lik[:, None, :]
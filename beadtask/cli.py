@@ -0,0 +1,51 @@
+"""Command line entry point: runs a session of the beads task"""
+import argparse
+
+from .constants import ADAPTIVE_DESIGN, MONITOR_ADDRESS, REALTIME_MODE
+
+
+def parse_address(address):
+    host, port = address.rsplit(':', 1)
+    return host, int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a session of the beads task")
+    parser.add_argument("--adaptive", action="store_true", default=ADAPTIVE_DESIGN,
+                        help="let the adaptive design pick the trials (see adaptive.py)")
+    parser.add_argument("--realtime", action="store_true", default=REALTIME_MODE,
+                        help="raise the process priority and disable the garbage collector during trials")
+    parser.add_argument("--monitor", type=parse_address, default=MONITOR_ADDRESS, metavar="HOST:PORT",
+                        help="publish the session's progress to the monitor at this address (see MonitorSession.py)")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the session (default: random)")
+    args = parser.parse_args(argv)
+
+    # The rendering layer is only loaded here, when a session actually runs
+    from psychopy import visual, core
+    from .task import BeadsTask, collect_subject_number
+    from .monitor import MonitorFeed
+
+    # Create window
+    win = visual.Window(fullscr=True, color="grey", waitBlanking=True)
+    
+    # Collect subject number
+    subject_number = collect_subject_number(win)
+    
+    monitor = MonitorFeed(args.monitor) if args.monitor is not None else None
+    exp = BeadsTask(win, subject_number, adaptive=args.adaptive, seed=args.seed, monitor=monitor, realtime=args.realtime)    
+    exp.publish('session_start')
+    exp.show_instructions()  
+    exp.run_experiment()
+    exp.save_results()
+    exp.publish('session_end', completed=len(exp.results))
+    if monitor is not None:
+        monitor.close()
+
+
+    thanks = visual.TextStim(win, text="Thank you :)", color="black", height=0.1)
+    thanks.draw()
+    win.flip()
+    core.wait(2)
+
+    win.close()
+    core.quit()
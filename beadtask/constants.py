@@ -0,0 +1,67 @@
+"""Constants and settings of the beads task (no PsychoPy needed)"""
+text_color = 'black'
+default_font = 'DejaVu Sans'
+
+RATIO_MAP = {
+    60: (60, 40),
+    90: (90, 10)
+}
+
+SEQUENCES = {
+    60: [ # 16
+        [1,1,1,1,1,0,0,0],
+        [0,0,0,1,1,1,1,1],
+        [0,1,1,1,0,1,1,0],
+        [0,1,1,0,1,1,1,0],
+        [1,1,1,1,1,1,0,0],
+        [0,0,1,1,1,1,1,1],
+        [1,0,1,1,1,1,0,1],
+        [1,1,1,1,1,1,1,0],
+        [0,1,1,1,1,1,1,1],
+        [1,1,1,1,1,0,1,1],
+        [1,1,0,1,1,1,1,1],
+        [1,1,1,1,1,1,1,1],
+        [1,1,1,1,0,1,0,0],
+        [0,0,1,0,1,1,1,1],
+        [1,1,0,1,1,1,0,0],
+        [0,0,1,1,1,0,1,1]
+    ],
+    90: [ # (11 + 5)
+        [1,1,1,1,1,0,0,0],
+        [0,0,0,1,1,1,1,1],
+        [0,1,1,1,0,1,1,0],
+        [0,1,1,0,1,1,1,0],
+        [1,1,1,1,1,1,0,0],
+        [0,0,1,1,1,1,1,1],
+        [1,0,1,1,1,1,0,1],
+        [1,1,1,1,1,1,1,0],
+        [0,1,1,1,1,1,1,1],
+        [1,1,1,1,1,0,1,1],
+        [1,1,0,1,1,1,1,1],
+        [1,1,1,1,1,1,1,1], 
+        [1,1,1,1,1,1,1,1],
+        [1,1,1,1,1,1,1,1],
+        [1,1,1,1,1,1,1,1],
+        [1,1,1,1,1,1,1,1]
+    ]
+}
+
+BLOCK_ORDER = [60, 90, 60, 90] 
+
+COLORS = ('green', 'blue')  # Colors are stored as their index in this tuple
+N_BEADS = 8
+
+# The weights of bead positions 1-8 in the evidence asymmetry
+WEIGHTS = [-3.5, -2.5, -1.5, -0.5, 0.5, 1.5, 2.5, 3.5]
+
+# IMPORTANT: set to True to let the adaptive design (see adaptive.py) pick each trial's sequence and ratio,
+# and stop each display condition early once the participant's omegas are estimated precisely enough
+ADAPTIVE_DESIGN = False
+
+# Address (host, port) of the experimenter's monitor (see MonitorSession.py) to publish the session's progress to,
+# e.g. ('192.168.1.10', 50500). None: no monitoring feed
+MONITOR_ADDRESS = None
+
+# IMPORTANT: set to True to raise the process priority and disable the garbage collector during trials (collecting
+# between trials and in breaks instead). GC pauses and the priority state are saved per trial either way
+REALTIME_MODE = False
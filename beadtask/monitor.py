@@ -0,0 +1,54 @@
+"""Monitoring feed of a running session (see MonitorSession.py for the experimenter's side)"""
+import json
+import queue
+import socket
+import threading
+import time
+
+
+# -------------------
+# Monitoring feed
+# -------------------
+class MonitorFeed:
+    """
+    Publishes events of a running session (trial start, ratings, choices, breaks) as JSON datagrams over UDP.
+    
+    publish() only puts the event in a bounded queue (never blocking: if the queue is full, the event is dropped);
+    a background thread encodes and sends the events. Dropped or lost datagrams are acceptable, the feed is only for monitoring.
+    """
+    def __init__(self, address, station=None, max_queue=1000):
+        self.address = address
+        self.station = station if station is not None else socket.gethostname()
+        self.events = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.thread = threading.Thread(target=self._send_events, daemon=True)
+        self.thread.start()
+    
+    def publish(self, subject, event, **fields):
+        try:
+            self.events.put_nowait((time.time(), subject, event, fields))
+        except queue.Full:
+            self.dropped += 1
+    
+    def _send_events(self):
+        while True:
+            item = self.events.get()
+            if item is None:
+                break
+            timestamp, subject, event, fields = item
+            message = {'station': self.station, 'subject': subject, 'event': event, 'time': timestamp, 'dropped': self.dropped}
+            message.update(fields)
+            try:
+                self.sock.sendto(json.dumps(message).encode(), self.address)
+            except OSError:
+                pass  # e.g. the monitor's network is unreachable
+    
+    def close(self, timeout=1.0):
+        """Send the queued events (waiting at most 'timeout' seconds), and stop the background thread"""
+        try:
+            self.events.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        self.sock.close()
@@ -0,0 +1,57 @@
+"""Real-time control of the trials (process priority and garbage collection)"""
+import gc
+import time
+
+from psychopy import core, logging
+
+
+# -------------------
+# Real-time control
+# -------------------
+class RealTimeControl:
+    """
+    Measures the pause of every garbage collection (through gc.callbacks). When enabled, it also raises the process
+    priority (core.rush) and disables the garbage collector during trials, such that collections only happen when
+    collect() is called between trials and in breaks.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.pauses = []  # durations (ms) of the collections since the start of the trial
+        self._gc_start = None
+        self._priority_warned = False
+        gc.callbacks.append(self._on_gc)
+    
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.pauses.append((time.perf_counter() - self._gc_start) * 1000)
+            self._gc_start = None
+    
+    def start_trial(self):
+        """Start of a trial. Returns whether the process priority was raised"""
+        self.pauses = []
+        if not self.enabled:
+            return False
+        gc.disable()
+        priority_raised = core.rush(True)
+        if not priority_raised and not self._priority_warned:
+            logging.warning("Could not raise the process priority (this may need administrator rights)")
+            self._priority_warned = True
+        return bool(priority_raised)
+    
+    def end_trial(self):
+        """End of a trial. Returns the durations (ms) of the collections during the trial"""
+        pauses = self.pauses
+        self.pauses = []
+        if self.enabled:
+            core.rush(False)
+            gc.enable()
+        return pauses
+    
+    def collect(self):
+        """Explicit collection (between trials, and in breaks)"""
+        gc.collect()
+    
+    def close(self):
+        gc.callbacks.remove(self._on_gc)
@@ -0,0 +1,93 @@
+"""The files of a session: the results file (read by the R analyses) and the session file (no PsychoPy needed)"""
+import csv
+import json
+
+from .constants import COLORS
+from .trials import TrialRecord
+
+
+RESULTS_COLUMNS = ['Subject', 'Trial', 'HiddenColor', 'Display', 'Ratio',
+                   'BeadPosition', 'Sequence', 'MajorityBeads', 'ProbEstimate',
+                   'FinalChoice', 'EvidenceAsymmetry', 'Accuracy']
+
+
+def session_filename(results_filename):
+    """beads_task_results_<subject>.csv -> beads_task_session_<subject>.json"""
+    return results_filename.replace("beads_task_results_", "beads_task_session_").replace(".csv", ".json")
+
+
+# -------------------
+# Write
+# -------------------
+def write_results(filename, subject_id, results):
+    """Write the results file: one row per probability estimate (9 per trial)"""
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=",")
+        writer.writerow(RESULTS_COLUMNS)
+
+        for t_num, t in enumerate(results, start=1):
+            # Convert sequence to string for better readability
+            sequence_str = ','.join(map(str, t.sequence))
+
+            # Calculate number of majority beads (1s in the sequence)
+            num_majority_beads = bin(t.sequence_mask).count('1')
+            accuracy = int(t.hidden == t.choice)
+
+            # Create a row for the prior estimate (bead position 0)
+            writer.writerow([
+                subject_id, t_num, t.hidden_color, t.display, t.ratio,
+                0, sequence_str, num_majority_beads, t.prob_estimates[0],
+                t.final_choice, t.evidence_asymmetry, accuracy
+            ])
+
+            # Create rows for each bead and subsequent probability estimate
+            for bead_pos, prob_estimate in enumerate(t.prob_estimates[1:], 1):
+                writer.writerow([
+                    subject_id, t_num, t.hidden_color, t.display, t.ratio,
+                    bead_pos, sequence_str, num_majority_beads, prob_estimate,
+                    t.final_choice, t.evidence_asymmetry, accuracy
+                ])
+
+
+def write_session(filename, subject_id, seed, window_size, frame_rate, realtime, results):
+    """Write what is needed (besides the results file) to replay the session: the seed, window and per-trial box seeds,
+       and the per-trial timing diagnostics (missed frames, GC pauses, whether the priority was raised)"""
+    session = {
+        'Subject': subject_id,
+        'Seed': seed,
+        'WindowSize': [int(x) for x in window_size],
+        'FrameRate': frame_rate,
+        'RealTime': realtime,
+        'Trials': [
+            {'Trial': t_num, 'BoxSeed': t.box_seed, 'MissedFrames': t.missed_frames,
+             'GcPausesMs': [round(pause, 3) for pause in t.gc_pauses], 'PriorityRaised': t.priority_raised}
+            for t_num, t in enumerate(results, start=1)
+        ]
+    }
+    with open(filename, "w") as f:
+        json.dump(session, f, indent=2)
+
+
+# -------------------
+# Read
+# -------------------
+def load_session(results_file, session_file):
+    """Rebuild the trial records of a session from its results file and session file"""
+    with open(session_file) as f:
+        session = json.load(f)
+    box_seeds = {t['Trial']: t['BoxSeed'] for t in session['Trials']}
+
+    trials = {}
+    with open(results_file, newline="") as f:
+        for row in csv.DictReader(f):
+            t_num = int(row['Trial'])
+            if t_num not in trials:
+                trials[t_num] = TrialRecord(
+                    row['HiddenColor'], row['Display'].lower() == 'true', int(row['Ratio']),
+                    [int(bead) for bead in row['Sequence'].split(',')],
+                    float(row['EvidenceAsymmetry']), box_seed=box_seeds[t_num]
+                )
+                trials[t_num].final_choice = row['FinalChoice'] if row['FinalChoice'] in COLORS else None
+            trials[t_num].add_estimate(float(row['ProbEstimate']))
+
+    return session, [trials[t_num] for t_num in sorted(trials)]
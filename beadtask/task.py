@@ -0,0 +1,1024 @@
+"""The rendering layer of the beads task: the PsychoPy screens and the experiment (BeadsTask)"""
+import psychopy
+#psychopy.useVersion('2023.1.3')
+
+from psychopy import visual, core, event, gui, logging
+import random
+import numpy as np
+
+from .constants import text_color, default_font, RATIO_MAP, SEQUENCES, BLOCK_ORDER, WEIGHTS
+from .trials import TrialRecord, generate_trials, generate_practice_trials, evidence_asymmetry
+from .adaptive import AdaptiveDesign
+from .realtime import RealTimeControl
+from .schema import write_results, write_session, session_filename
+
+
+# -------------------
+# Other
+# -------------------
+def collect_subject_number(win):
+    """Prompt the experimenter for the subject number (typed on the keyboard, confirmed with return)"""
+    subject_number = ""
+    text_stim = visual.TextStim(win, text="Enter subject number: ", pos=(0, 0.2), color = text_color, font = default_font)
+    response_stim = visual.TextStim(win, text="", pos=(0, -0.2), color = text_color, font = default_font)
+
+    while True:
+        text_stim.draw()
+        response_stim.text = subject_number
+        response_stim.draw()
+        win.flip()
+
+        keys = event.waitKeys()
+        if 'return' in keys:
+            break
+        elif 'backspace' in keys:
+            subject_number = subject_number[:-1]
+        elif len(keys[0]) == 1:
+            subject_number += keys[0]
+    return subject_number
+
+
+def destretch_stimuli(stimuli, win):
+    """
+    Corrects horizontal stretching for stimuli in a 'norm' coordinate system.
+    Scales widths and x-positions so shapes look proportionally correct.
+
+    Parameters
+    ----------
+    stimuli : list
+        List (or iterable) of PsychoPy stimuli (e.g., Rect, Circle, TextStim, etc.)
+    win : psychopy.visual.Window
+        The PsychoPy window (used to get aspect ratio)
+    """
+    aspect = win.size[0] / win.size[1]  # width / height
+
+    for stim in stimuli:
+        # Adjust X position
+        if hasattr(stim, 'pos'):
+            stim.pos = (stim.pos[0] / aspect, stim.pos[1])
+        # Adjust width (or size tuple)
+        if hasattr(stim, 'width') and hasattr(stim, 'height'):
+            stim.width /= aspect
+        elif hasattr(stim, 'size'):
+            stim.size = (stim.size[0] / aspect, stim.size[1])
+
+
+# -------------------
+# Experiment class
+# -------------------
+class BeadsTask:
+    def __init__(self, win, subject_id, adaptive=False, seed=None, frame_rate=None, monitor=None, realtime=False):
+        self.win = win
+        self.subject_id = subject_id
+        self.results = []
+        self.adaptive = adaptive
+        self.monitor = monitor  # a MonitorFeed, or None
+        self.realtime = RealTimeControl(enabled=realtime)
+        
+        # All randomness (trial order, hidden boxes, box arrangements) is drawn from one seeded generator,
+        # and the seed is saved with the results, such that sessions can be replayed (see ReplaySession.py)
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**31)
+        self.rng = random.Random(self.seed)
+
+        # Pre-create and cache visual stimuli to avoid repeated creation
+        self.blue_box = visual.Rect(win, width=0.2, height=0.2,
+                                    fillColor='blue', lineColor='blue')
+        self.green_box = visual.Rect(win, width=0.2, height=0.2,
+                                     fillColor='green', lineColor='green')
+        
+        # Pre-create and cache visual stimuli to avoid repeated creation
+        self.slider = visual.Slider(
+            win, 
+            ticks=[0, 0.5, 1], 
+            granularity=0,
+            labels = ['', '', ''],
+            style=['rating'], 
+            size=(0.75, 0.1),
+            pos=(0, -0.4),
+            color = text_color,
+            fillColor= text_color,  
+            lineColor= text_color,
+            font = 'DejaVu Sans'
+        )
+        
+        # Pre-create mouse
+        self.mouse = event.Mouse(win=self.win)
+        
+        # hide default marker
+        self.slider.marker.color = None
+        self.slider.marker.opacity = 0
+        
+        # Pre-calculate and cache common values
+        self.weights = WEIGHTS
+        self.bead_radius = 0.07
+        self.bead_spacing = 0.15
+        self.total_beads = 8
+        self.box_displacement = 0.20  # how far the boxes are moved towards each other on the 'Trial Start' screen
+        
+        # Box screens of upcoming trials, pre-rendered during breaks (see show_break)
+        self.prepared_boxes = {}
+        
+        # Pre-create reusable visual elements
+        self._create_reusable_stimuli()
+        
+        # Measure the refresh rate once (unless given), and precompute the frames of the bead-rise animation
+        self._precompute_bead_rise(frame_rate=frame_rate)
+
+        # Generate all trials automatically (in adaptive mode, the main trials are instead appended one at a time)
+        if self.adaptive:
+            self.adaptive_design = AdaptiveDesign()
+            self.trials = []
+        else:
+            self.trials = self.generate_trials()
+        self.practice_trials = self.generate_practice_trials()
+
+    def _create_reusable_stimuli(self):
+        """Pre-create reusable visual stimuli to avoid repeated creation during trials
+        
+           Ideally, all stimulus-objects which are to be drawn on screen more than once, could
+           be CREATED with this method. The methods responsible for drawing, or gathering drawable
+           objects in a list, to be drawn, will then only need to modify appropriate attributes
+           of the pre-created objects.
+           
+           Also to ensure nice aspect-ratios (relating to width/height of objects relative to window size
+           all precreated stimuli is also 'destretched' in this method, rather than every time they are drawn.
+        
+        """
+   
+        # Pre-create bead circles for different colors (specifically, those used in the draw-animations, and the visual record) and destretch
+        self.bead_circles = {
+            'blue': visual.Circle(self.win, radius=self.bead_radius, fillColor='blue', 
+                                 lineColor='blue', pos=(0, 0)),
+            'green': visual.Circle(self.win, radius=self.bead_radius, fillColor='green', 
+                                  lineColor='green', pos=(0, 0)),
+            'empty': visual.Circle(self.win, radius=self.bead_radius, fillColor='white', 
+                                  lineColor='white', pos=(0, 0))
+        }
+        
+        destretch_stimuli(self.bead_circles.values(), self.win)
+        
+        # Pre-create common text stimuli
+        self.prior_text = visual.TextStim(
+            self.win,
+            text="Before seeing any beads,\nestimate the probability of the Hidden Box \n by clicking on the slider",
+            color=text_color, pos=(0, 0.1), height=0.08
+        )
+
+        self.est_prob_text = visual.TextStim(
+            self.win,
+            text="Estimate the probability of the Hidden Box given the bead sample",
+            color=text_color, pos = (0, 0.1), height=0.08
+        )
+        
+        self.final_choice_text1 = visual.TextStim(
+            self.win, 
+            text="Which box was the Hidden Box? \n Press left arrow for the left box, right arrow for the right box",
+            color=text_color, pos=(0, 0.1), height=0.08
+        )
+        
+        destretch_stimuli([self.prior_text,self.est_prob_text, self.final_choice_text1], self.win)
+        
+        # Pre-create the stimulus-objects that make up the two boxes
+    
+        # Define parameters relating to box positions and dimensions, margins, bead size and number of beads.
+        self.left_box_pos, self.right_box_pos = (-1.0, -0.4), (1.0, -0.4)
+        self.n_rows, self.n_cols = 10, 10
+        self.circle_radius = 0.02
+        self.grid_width = self.n_cols * self.circle_radius * 2.5
+        self.grid_height = self.n_rows * self.circle_radius * 2.5
+        self.grid_margin = 0.02
+        self.max_beads = self.n_rows * self.n_cols  # 100 beads per box
+        
+        # Make two lists, holding the position of each of the 100 + 100 beads making up the two boxes
+        self.green_bead_positions = []
+        self.blue_bead_positions = []
+
+        for i in range(self.n_rows):
+            for j in range(self.n_cols):
+                x_green = self.left_box_pos[0] - (self.grid_width / 2 - self.grid_margin) + j * self.circle_radius * 2.5
+                y_green = self.left_box_pos[1] + (self.grid_height / 2 - self.grid_margin) - i * self.circle_radius * 2.5
+                self.green_bead_positions.append((x_green, y_green))
+
+                x_blue = self.right_box_pos[0] - (self.grid_width / 2 - self.grid_margin) + j * self.circle_radius * 2.5
+                y_blue = self.right_box_pos[1] + (self.grid_height / 2 - self.grid_margin) - i * self.circle_radius * 2.5
+                self.blue_bead_positions.append((x_blue, y_blue))
+        
+        # Pre-create beads for green box (positions are predefined, while fillColor will be decided in the draw_boxes method)
+        self.green_beads = []
+        for i in range(self.max_beads):
+            circ = visual.Circle(
+                self.win,
+                radius=self.circle_radius,
+                fillColor='white',  # default color, will update per trial
+                lineColor='white',
+                pos=self.green_bead_positions[i]
+            )
+            self.green_beads.append(circ)
+
+        # Pre-create beads for blue box (positions are predefined, while fillColor will be decided in the draw_boxes method)
+        self.blue_beads = []
+        for i in range(self.max_beads):
+            circ = visual.Circle(
+                self.win,
+                radius=self.circle_radius,
+                fillColor='white',
+                lineColor='white',
+                pos=self.blue_bead_positions[i]
+            )
+            self.blue_beads.append(circ)
+
+        # Pre-create frames
+        self.green_frame = visual.Rect(
+            self.win,
+            width= self.grid_width + self.grid_margin,
+            height= self.grid_height + self.grid_margin,
+            fillColor='dimgrey',
+            lineColor='darkgreen',
+            lineWidth=12,
+            pos=self.left_box_pos  # default left box position
+        )
+
+        self.blue_frame = visual.Rect(
+            self.win,
+            width= self.grid_width + self.grid_margin,
+            height= self.grid_height + self.grid_margin,
+            fillColor='dimgrey',
+            lineColor='darkblue',
+            lineWidth=12,
+            pos=self.right_box_pos # default right box position
+        )
+        
+        self.green_frame.color_id = 'green'
+        self.blue_frame.color_id = 'blue'
+        
+        # Apply destretch ONCE to the pre-created objects making up the two boxes
+        destretch_stimuli(self.green_beads + self.blue_beads + [self.green_frame, self.blue_frame], self.win)
+        
+        # Pre-create the 'Green Box' / 'Blue Box' labels
+        self.left_label = visual.TextStim(
+                self.win, 
+                text="Green box", 
+                color='darkgreen',
+                pos=(self.left_box_pos[0], self.left_box_pos[1] + (self.green_frame.height / 2) + 0.06), 
+                height=0.08
+                )
+                
+        self.right_label = visual.TextStim(
+                self.win, 
+                text="Blue box", 
+                color='darkblue',
+                pos=(self.right_box_pos[0], self.right_box_pos[1] + (self.blue_frame.height / 2) + 0.06), 
+                height=0.08
+                )
+        
+        # Ratio labels (initialized empty, update text per trial)
+        self.green_ratio_text_top = visual.TextStim(self.win, text="", color=text_color, height=0.08)
+        self.green_ratio_text_bottom = visual.TextStim(self.win, text="", color=text_color, height=0.08)
+        self.blue_ratio_text_top = visual.TextStim(self.win, text="", color=text_color, height=0.08)
+        self.blue_ratio_text_bottom = visual.TextStim(self.win, text="", color=text_color, height=0.08)
+        
+        # Destretch the left/right-labels and the ratio labels
+        destretch_stimuli([self.left_label, self.right_label,
+                       self.green_ratio_text_top, self.green_ratio_text_bottom,
+                       self.blue_ratio_text_top, self.blue_ratio_text_bottom], self.win)
+        
+        
+        # Pre-create objects related to the slider - the marker bar (yellow), and the dynamic labels
+        
+        # Slider marker
+        self.marker_bar = visual.Rect(
+            win=self.win,
+            width=0.01,
+            height=0.15,
+            fillColor='yellow',
+            lineColor='black',
+            lineWidth=2,
+            pos=(0, -0.4)  # initial position
+        )
+
+        # Slider end labels (dynamic text, reuse)
+        self.slider_left_label = visual.TextStim(
+            win=self.win,
+            text='0%',           # placeholder
+            pos=(-0.5, -0.55),   # placeholder
+            color='black',
+            height=0.06
+        )
+
+        self.slider_right_label = visual.TextStim(
+            win=self.win,
+            text='100%',
+            pos=(0.5, -0.55),    # placeholder
+            color='black',
+            height=0.06
+        )
+        
+        # Pre-create the question-mark box (for the animaton)
+        self.question_box = visual.Rect(
+                            self.win, 
+                            width=self.green_frame.width, # Same size as the 'green' and 'blue box'
+                            height=self.green_frame.height, # Same size as the 'green' and 'blue box'
+                            fillColor='white', 
+                            lineColor='black', 
+                            pos=(0, -0.2)
+                            )
+        self.question_text = visual.TextStim(
+                            self.win, 
+                            text='?', 
+                            color=text_color, 
+                            height=0.15, 
+                            pos = self.question_box.pos
+                            )
+         
+        # Pre-create objects / stimuli related to the percent display
+        self.percent_header = visual.TextStim(
+            self.win,
+            text= "", # To be updated during trials
+            color=text_color, height=0.07, pos=(0, 0.5)
+        )
+        self.percent_blue_text = visual.TextStim(
+            self.win,
+            text="", # To be updated during trials
+            color='blue', height=0.08, pos=(0.0, 0.38)
+        )
+        self.percent_green_text = visual.TextStim(
+            self.win,
+            text="", # To be updated during trials
+            color='green', height=0.08, pos=(0.0, 0.28)
+        )
+        
+    def _precompute_bead_rise(self, duration=0.8, rise=0.4, frame_rate=None):
+        """Precompute the per-frame y-positions of the bead-rise animation (sine-in-out easing over 'duration' seconds)
+        
+           The refresh rate is measured once, such that the animation is played back frame by frame, showing the
+           same positions on every machine running at the same refresh rate, regardless of how late a single flip is.
+        """
+        self.frame_rate = frame_rate if frame_rate is not None else self.win.getActualFrameRate()
+        if self.frame_rate is None:
+            logging.warning("Could not measure the refresh rate, assuming 60 Hz for the bead-rise animation")
+            self.frame_rate = 60.0
+        self.frame_duration = 1.0 / self.frame_rate
+        
+        # starts right below top edge of question box (barely visible), and rises to top position some space above the box
+        self.bead_rise_start_y = self.question_box.pos[1] + (self.question_box.height / 2) - (self.bead_circles['blue'].radius * 2)
+        self.bead_rise_end_y = self.bead_rise_start_y + rise
+        
+        n_frames = int(round(duration * self.frame_rate))
+        t = np.arange(n_frames) / n_frames  # normalized time 0->1 (the end position is shown by the hold-frame)
+        self.bead_rise_y = self.bead_rise_start_y + rise * 0.5 * (1 - np.cos(np.pi * t))
+    
+    def animate_bead_rise(self, bead_stim):
+        """Play back the precomputed bead-rise frames, one position per flip. Returns the number of missed frames"""
+        missed_frames = 0
+        last_flip = None
+        for y_pos in self.bead_rise_y:
+            self.draw_bead_rise_frame(bead_stim, y_pos)
+            flip_time = self.win.flip()
+            
+            # A flip arriving more than half a frame late means (at least) one frame was missed
+            if last_flip is not None:
+                missed_frames += max(0, int(round((flip_time - last_flip) / self.frame_duration)) - 1)
+            last_flip = flip_time
+        
+        if missed_frames > 0:
+            logging.warning(f"Bead-rise animation missed {missed_frames} of {len(self.bead_rise_y)} frames")
+        return missed_frames
+        
+    # -------------------
+    # Instructions
+    # -------------------
+    def show_instructions(self):
+        """Display experiment instructions to the participant"""
+        # Create instruction stimuli
+        line1 = visual.TextStim(self.win, text="In this task, beads will be drawn from one of two boxes:",
+                                color=text_color, height=0.08, pos=(0, 0.45))
+
+        green_box_text = visual.TextStim(self.win, text="Green Box (mostly Green Beads)",
+                                         color="green", height=0.08, pos=(-0.47, 0.2))
+
+        blue_box_text = visual.TextStim(self.win, text="Blue Box (mostly Blue Beads)",
+                                        color="blue", height=0.08, pos=(0.47, 0.2))
+
+        task_text = visual.TextStim(
+            self.win,
+            text=("One of these boxes will be chosen RANDOMLY as the Hidden Box.\n"
+                  "Beads will be drawn RANDOMLY from it, one at a time WITH REPLACEMENT.\n"
+                  "After each bead draw, you will estimate by use of a slider, which box you think more probable to have been chosen as the hidden box.\n"
+                  "After 8 beads have been drawn, you will decide which one of the two boxes you think the sample was drawn from."),
+            color=text_color, height=0.07, wrapWidth=1.5, pos=(0, -0.2)
+        )
+
+        presskey = visual.TextStim(self.win, text="Press any key to continue...",
+                                   color="yellow", height=0.08, pos=(0, -0.7))
+        
+        # Display all instruction elements
+        for stim in [line1, green_box_text, blue_box_text, task_text, presskey]:
+            stim.draw()
+
+        self.win.flip()
+        event.waitKeys()
+        
+        # Inform the participants of the blocks (in adaptive mode, the number of trials per block depends on the participant's responses)
+        if self.adaptive:
+            blocks_text = (f"In the main experiment you will complete two blocks of between {self.adaptive_design.min_trials} "
+                           f"and {self.adaptive_design.max_trials} trials each, with a 1-minute break between them. \n")
+        else:
+            blocks_text = "In the main experiment you will complete two blocks of 32 trials each. \n"
+        practice_trials_text = visual.TextStim(
+            self.win,
+            text=(blocks_text +
+                  "In the first block a visual record of beads drawn will be present, to help you keep track of the beads drawn so far. \n"
+                  "In the second block, instead of a visual record, you will be informed of the percentwise distribution of blue and green beads drawn so far, which will be updated as beads are drawn. \n"
+                  "\n Before beginning the main experiment, you will complete 4 practice trials, to get a grasp on the task. \n"
+                  ),
+            color=text_color, height=0.07, wrapWidth=1.5, pos=(0, 0)
+        )
+        
+        practice_trials_text.draw()
+        presskey.draw()
+        self.win.flip()
+        event.waitKeys()
+        
+    # -------------------
+    # Trial generator
+    # -------------------
+    def generate_trials(self):
+        return generate_trials(self.rng)
+    
+    # -------------------
+    # Show boxes + ratios
+    # -------------------
+    
+    # Note: this method doesn't draw, but returns a list of objects to be drawn in the order of first list element to last list element
+    def draw_ratio_labels(self, ratio):
+        # Update ratio labels
+        self.green_ratio_text_top.text = f"{RATIO_MAP[ratio][0]} Green"
+        self.green_ratio_text_bottom.text = f"{RATIO_MAP[ratio][1]} Blue"
+        self.green_ratio_text_top.pos = (self.left_label.pos[0], self.left_label.pos[1] + 2*0.08)
+        self.green_ratio_text_bottom.pos = (self.left_label.pos[0], self.green_ratio_text_top.pos[1] - 0.08)
+        
+        self.blue_ratio_text_top.text = f"{RATIO_MAP[ratio][0]} Blue"
+        self.blue_ratio_text_bottom.text = f"{RATIO_MAP[ratio][1]} Green"
+        self.blue_ratio_text_top.pos = (self.right_label.pos[0], self.right_label.pos[1] + 2*0.08)
+        self.blue_ratio_text_bottom.pos = (self.right_label.pos[0], self.blue_ratio_text_top.pos[1] - 0.08)
+        
+        # Put the labels into a list which is returned
+        label_list = [self.green_ratio_text_top, 
+                      self.green_ratio_text_bottom, 
+                      self.blue_ratio_text_top, 
+                      self.blue_ratio_text_bottom]
+        
+        return label_list
+    
+    # Note: this method doesn't draw, but returns a list of objects to be drawn in the order of first list element to last list element
+    def draw_boxes(self, ratio, box_seed=None):        
+        # Unpack ratio (green-to-blue bead ratio, e.g., [60, 40])
+        ratio_green, ratio_blue = RATIO_MAP[ratio]
+        
+        # Create randomized color assignments for each box (seeded per trial, such that the arrangement can be replayed)
+        box_rng = random.Random(box_seed)
+        green_box_colors = ['green'] * ratio_green + ['blue'] * ratio_blue
+        blue_box_colors = ['blue'] * ratio_green + ['green'] * ratio_blue
+        box_rng.shuffle(green_box_colors)
+        box_rng.shuffle(blue_box_colors)
+        
+        # Start coloring the beads
+        for bead, color in zip(self.green_beads, green_box_colors):
+            bead.fillColor = color
+            bead.lineColor = color
+        for bead, color in zip(self.blue_beads, blue_box_colors):
+            bead.fillColor = color
+            bead.lineColor = color
+
+        # Update frame colors
+        self.green_frame.lineColor = 'darkgreen' if ratio_green > ratio_blue else 'darkblue'
+        self.blue_frame.lineColor = 'darkblue' if ratio_green > ratio_blue else 'darkgreen'
+        
+        # Create the list which is going to contain all the recolored objects to be drawn
+        # - start with frames to ensure the drawing order is correct (backmost elements drawn first)
+        draw_list = [
+            self.green_frame, self.blue_frame,
+            *self.green_beads, *self.blue_beads,
+            self.left_label, self.right_label
+        ]
+        
+        return draw_list
+
+    # -------------------
+    # Draw visual bead display
+    # -------------------
+    def draw_display(self, drawn_beads, hidden_color):
+        """Optimized bead display using pre-calculated values and cached circles"""
+        # Use pre-cached values instead of recalculating
+        start_x = -(self.total_beads - 1) * self.bead_spacing / 2
+        y_pos = 0.4
+
+        # Pre-calculate colors
+        majority_color = hidden_color
+        minority_color = 'green' if majority_color == 'blue' else 'blue'
+
+        for i in range(self.total_beads):
+            pos_x = start_x + i * self.bead_spacing
+            if i < len(drawn_beads):
+                bead_color = majority_color if drawn_beads[i] == 1 else minority_color
+                # Use cached circle and update position/color
+                circle = self.bead_circles[bead_color]
+                circle.pos = (pos_x, y_pos)
+            else:
+                # Use cached empty circle
+                circle = self.bead_circles['empty']
+                circle.pos = (pos_x, y_pos)
+            circle.draw()
+
+    # -------------------
+    # Draw numeric display (percent of total 8)
+    # -------------------
+    def draw_numeric_display(self, drawn_beads, hidden_color):
+        """Optimized numeric display with pre-calculated values"""
+        # Use pre-cached total_beads value
+        majority_color = hidden_color
+        minority_color = 'green' if majority_color == 'blue' else 'blue'
+
+        # More efficient counting using sum() with generator expression
+        num_majority_drawn = sum(1 for b in drawn_beads if b == 1)
+        num_minority_drawn = len(drawn_beads) - num_majority_drawn  # Avoid second sum
+
+        # Pre-calculate percentages
+        majority_percent = (num_majority_drawn / len(drawn_beads)) * 100
+        minority_percent = (num_minority_drawn / len(drawn_beads)) * 100
+
+        # Optimize color assignment
+        if majority_color == 'blue':
+            blue_percent, green_percent = majority_percent, minority_percent
+        else:
+            blue_percent, green_percent = minority_percent, majority_percent
+        
+        # Update the text of percent display according to trial information
+        self.percent_header.text = f"Percentwise distribution of the {len(drawn_beads)}/8 beads drawn so far:"
+        self.percent_blue_text.text = f"Blue: {blue_percent:.1f}%"
+        self.percent_green_text.text =  f"Green: {green_percent:.1f}%"
+        
+        for text in [self.percent_header, self.percent_blue_text, self.percent_green_text]:
+            text.draw()
+
+    # -------------------
+    # Trial screens (drawn without flipping; shared by run_trial and the offscreen replay in ReplaySession.py)
+    # -------------------
+    def boxes_capture_rect(self, objects, margin_px=8):
+        """The window area (left, top, right, bottom, in norm units) covering the box frames and text labels among objects,
+           snapped to whole pixels, such that a BufferImageStim of the boxes only captures (and keeps) that area
+        """
+        width_px, height_px = self.win.size
+        left, top, right, bottom = width_px, 0.0, 0.0, height_px  # in pixels, from the bottom left corner
+        for object in objects:
+            if isinstance(object, visual.TextStim):
+                bounding_box = getattr(object, 'boundingBox', None)
+                if bounding_box is not None:
+                    half_w, half_h = bounding_box[0] / 2, bounding_box[1] / 2
+                else:
+                    half_w = half_h = len(object.text) * object.height * height_px / 4  # generous estimate of the text width
+            elif isinstance(object, visual.Rect):
+                half_w, half_h = object.width * width_px / 4, object.height * height_px / 4
+            else:
+                continue  # the beads lie inside the frames
+            x, y = (object.pos[0] + 1) * width_px / 2, (object.pos[1] + 1) * height_px / 2
+            left, right = min(left, x - half_w), max(right, x + half_w)
+            bottom, top = min(bottom, y - half_h), max(top, y + half_h)
+        
+        left, bottom = max(0, np.floor(left) - margin_px), max(0, np.floor(bottom) - margin_px)
+        right, top = min(width_px, np.ceil(right) + margin_px), min(height_px, np.ceil(top) + margin_px)
+        return [float(2 * left / width_px - 1), float(2 * top / height_px - 1),
+                float(2 * right / width_px - 1), float(2 * bottom / height_px - 1)]
+    
+    def move_boxes(self, objects, displacement):
+        """Move objects left of the centre 'displacement' to the right, and objects right of the centre to the left (negative values move them apart)"""
+        for object in objects:
+            if object.pos[0] < 0:
+                object.pos = (object.pos[0] + displacement, object.pos[1])
+            elif object.pos[0] > 0:
+                object.pos = (object.pos[0] - displacement, object.pos[1])
+    
+    def slider_hover_value(self):
+        """Map the mouse x-position to the slider range [0,1] (clipped)"""
+        mouse_x = self.mouse.getPos()[0]
+        slider_min = self.slider.pos[0] - self.slider.size[0] / 2
+        slider_max = self.slider.pos[0] + self.slider.size[0] / 2
+        return np.clip((mouse_x - slider_min) / (slider_max - slider_min), 0, 1)
+    
+    def draw_bead_record(self, trial, n_beads):
+        """Draw the display of the first n_beads beads (visual or percentage format) according to the block"""
+        if trial.display:
+            self.draw_display(trial.sequence[:n_beads], trial.hidden_color)
+        else:
+            self.draw_numeric_display(trial.sequence[:n_beads], trial.hidden_color)
+    
+    def draw_rating_screen(self, static_stim, prompt_text, hover_value, trial=None, n_beads=0):
+        """Draw the boxes, the prompt and the slider with the marker bar at hover_value (and the record of the first n_beads beads)"""
+        slider_min = self.slider.pos[0] - self.slider.size[0] / 2
+        slider_max = self.slider.pos[0] + self.slider.size[0] / 2
+        hover_x = slider_min + hover_value * (slider_max - slider_min)
+        
+        # Update marker bar position
+        self.marker_bar.pos = (hover_x, -0.4)
+        
+        # Compute left/right probabilities and draw the slider end labels dynamically
+        right_prob = int(round(hover_value * 100))
+        left_prob = 100 - right_prob
+        
+        self.slider_left_label.text = f'{left_prob}%'
+        self.slider_left_label.pos = (slider_min, -0.55)
+        self.slider_right_label.text = f'{right_prob}%'
+        self.slider_right_label.pos = (slider_max, -0.55)
+        
+        # Draw the two boxes again
+        static_stim.draw()
+        
+        # Draw prompt text, slider and slider related elements (marker bar and labels) 
+        prompt_text.draw()
+        self.slider.draw()
+        self.marker_bar.draw()
+        self.slider_left_label.draw()
+        self.slider_right_label.draw()
+        
+        if n_beads > 0:
+            self.draw_bead_record(trial, n_beads)
+    
+    def draw_bead_rise_frame(self, bead_stim, y_pos):
+        """Draw in order: bead, box (so bead is behind the box in the beginning)"""
+        bead_stim.pos = (0, y_pos)
+        bead_stim.draw()
+        self.question_box.draw()
+        self.question_text.draw()
+    
+    def draw_bead_hold_frame(self, bead_stim):
+        """Draw the bead held at the top of the question box"""
+        self.question_box.draw()
+        self.question_text.draw()
+        bead_stim.pos = (0, self.bead_rise_end_y)
+        bead_stim.draw()
+    
+    def draw_final_choice_screen(self, static_stim, list_of_box_objects, trial, choice=None):
+        """Draw the final choice screen. Once a choice is made, the border of the chosen box is drawn in yellow"""
+        if choice is None:
+            # Draw the boxes
+            static_stim.draw()
+        else:
+            # Change the border color of the chosen box to yellow and draw the boxes again. 
+            for object in list_of_box_objects:
+                if (isinstance(object, visual.Rect) and getattr(object, 'color_id', '') == choice):
+                    object.lineColor = 'yellow'
+                object.draw()
+        
+        # Draw the bead record / final percent distribution 
+        self.draw_bead_record(trial, 8)
+        
+        # Draw the final choice text
+        self.final_choice_text1.draw()
+
+    # -------------------
+    # Run one trial
+    # -------------------
+    def run_trial(self, trial_num, practice):
+        # Determine whether the trial being run is practice or not (we're not saving practice data)
+        if practice == True:
+            trial = self.practice_trials[trial_num]
+        else:
+            trial = self.trials[trial_num]
+        trial.priority_raised = self.realtime.start_trial()
+        self.publish('trial_start', trial=trial_num + 1, practice=practice, ratio=trial.ratio, display=trial.display)
+
+        # Use the box screens pre-rendered during the preceding break, if there are any (see show_break)
+        prepared = self.prepared_boxes.pop(trial, None)
+        
+        # Show boxes and their appropriate labels (in Ashinoff Fig 1a: 'Trial Start')
+        if prepared is not None:
+            together_stim, static_stim = prepared
+            list_of_box_objects = []  # recolored while the 'Trial Start' screen is shown (below)
+            together_stim.draw()
+        else:
+            label_list = self.draw_ratio_labels(trial.ratio)
+            
+            # Forgive the name: 'list_of_box_objects' contains a list of all the drawable objects making up the left and right box
+            list_of_box_objects = self.draw_boxes(trial.ratio, trial.box_seed)
+            
+            # Move the boxes close together when they are first seen
+            self.move_boxes(label_list + list_of_box_objects, self.box_displacement)
+            for object in (label_list + list_of_box_objects):
+                object.draw()
+        
+        self.win.flip()
+        if prepared is not None:
+            # The box objects (drawn to highlight the final choice) are recolored during the wait, off the response path
+            self.idle_wait(3.0, [lambda: list_of_box_objects.extend(self.draw_boxes(trial.ratio, trial.box_seed))])
+        else:
+            core.wait(3.0)
+        
+        # Transition to prior rating screen
+        self.win.flip()
+        core.wait(0.5)  
+        
+        if prepared is None:
+            # Move the two boxes further apart again (such that the slider fits inbetween them)
+            self.move_boxes(label_list + list_of_box_objects, -self.box_displacement)
+            
+            # This sort of takes a 'screenshot' of the two boxes to be drawn, and those screenshots are drawn, rather than 200+ elements
+            static_stim = visual.BufferImageStim(self.win, stim=list_of_box_objects + label_list,
+                                                 rect=self.boxes_capture_rect(list_of_box_objects + label_list))
+        
+        # Prior rating - optimized with cached stimuli (in Ashinoff Fig 1a: 'Draw (0)')
+        self.mouse.clickReset()
+        self.slider.reset()
+        prior_collected = False
+        while not prior_collected:
+            # Cursor control of the slider
+            self.draw_rating_screen(static_stim, self.prior_text, self.slider_hover_value())
+            self.win.flip()
+
+            rating = self.slider.getRating()
+            if rating is not None:
+                trial.add_estimate(rating)
+                prior_collected = True
+                self.publish('rating', trial=trial_num + 1, practice=practice, bead=0, rating=rating)
+
+            # Optimized escape key handling
+            if 'escape' in event.getKeys(keyList=['escape']):
+                self.win.close()
+                self.save_results() 
+                core.quit()
+
+        # Bead sequence - optimized with cached stimuli
+        majority_color = trial.hidden_color
+        minority_color = 'green' if majority_color == 'blue' else 'blue'
+        
+        # (The following Corresponds to Ashinoff Fig 1a: 'Draw (1) + Estimate (1) + ... + Draw (8) + Estimate (8))
+        for idx, bead in enumerate(trial.sequence):
+            # Draw the white question mark box, before having the bead rise from it
+            self.question_box.draw()
+            self.question_text.draw()
+            self.win.flip()
+            
+            # Determine bead color and animate bead rising from the box
+            bead_color = majority_color if bead == 1 else minority_color
+            bead_stim = self.bead_circles[bead_color]
+            
+            # Frame-locked animation (positions precomputed in _precompute_bead_rise)
+            trial.missed_frames += self.animate_bead_rise(bead_stim)
+
+            # Hold bead at top of the question box briefly
+            self.draw_bead_hold_frame(bead_stim)
+            self.win.flip()
+            core.wait(0.3)
+
+            # Rating after bead - optimized with cached stimuli
+            self.mouse.clickReset()
+            self.slider.reset()
+            rating_collected = False
+            while not rating_collected:
+                # Cursor control of the slider, and the bead record of the beads drawn so far
+                self.draw_rating_screen(static_stim, self.est_prob_text, self.slider_hover_value(), trial, idx + 1)
+                self.win.flip()
+                
+                # Collect rating
+                rating = self.slider.getRating()
+                if rating is not None:
+                    trial.add_estimate(rating)
+                    rating_collected = True
+                    self.publish('rating', trial=trial_num + 1, practice=practice, bead=idx + 1, rating=rating)
+
+                # Optimized escape key handling
+                if 'escape' in event.getKeys(keyList=['escape']):
+                    self.win.close()
+                    self.save_results() 
+                    core.quit()
+        
+        # Final choice 
+        self.draw_final_choice_screen(static_stim, list_of_box_objects, trial)
+        
+        # Show it
+        self.win.flip()
+        
+        # Record the answer
+        keys = event.waitKeys(keyList=['left', 'right', 'escape'])
+        if 'escape' in keys:
+            self.win.close()
+            self.save_results()
+            core.quit()
+        elif keys[0] in ['left', 'right']:
+            trial.final_choice = 'green' if keys[0] == 'left' else 'blue'
+            self.publish('choice', trial=trial_num + 1, practice=practice, choice=trial.final_choice,
+                         correct=trial.final_choice == trial.hidden_color)
+            
+            # Highlight the chosen box
+            self.draw_final_choice_screen(static_stim, list_of_box_objects, trial, trial.final_choice)
+            self.win.flip()
+            core.wait(0.3)
+    
+        trial.gc_pauses = self.realtime.end_trial()
+        if (practice == False): 
+            self.results.append(trial)
+        
+        # Blank inter-trial gap (where the garbage is collected, in real-time mode)
+        self.win.flip()
+        if self.realtime.enabled:
+            self.idle_wait(0.5, [self.realtime.collect], margin=0.1)
+        else:
+            core.wait(0.5)
+    
+    # -------------------
+    # Show break text
+    # -------------------
+    def show_break(self, duration=60, message="Pause", next_trials=(), get_ready=5.0):
+        """Show the break screens ('duration' seconds of the break message, then 'get_ready' seconds of the 'Get ready' message).
+           While waiting, the next block is prepared off the critical path of its trials: the box screens of next_trials
+           are pre-rendered, the text caches are warmed, and the results are saved and garbage collected.
+           The break lasts exactly as long as before.
+        """
+        break_text = visual.TextStim(
+            self.win, 
+            text=message, 
+            color=text_color, height=0.07, wrapWidth=1.5
+        )
+        
+        break_text.draw()
+        self.win.flip()
+        self.publish('break', duration=duration + get_ready, completed=len(self.results))
+        
+        tasks = [lambda trial=trial: self.prepare_trial_boxes(trial) for trial in next_trials]
+        tasks += [self._warm_text_caches, self.save_results, self.realtime.collect]
+        self.idle_wait(duration, tasks)
+        
+        break_over_text = visual.TextStim(
+            self.win, 
+            text="Get ready. The next block will begin in a few seconds.", 
+            color=text_color, height=0.07, wrapWidth=1.5
+        )
+        
+        break_over_text.draw()
+        self.win.flip()
+        self.idle_wait(get_ready, tasks)
+        self.publish('break_end')
+    
+    def idle_wait(self, duration, tasks, margin=0.5):
+        """Wait for 'duration' seconds, running (and removing) tasks from the list while at least 'margin' seconds remain
+        
+           The tasks draw only to the back buffer (which is cleared after each), so the screen shown is not affected.
+        """
+        timer = core.CountdownTimer(duration)
+        while tasks and timer.getTime() > margin:
+            tasks.pop(0)()
+            self.win.clearBuffer()
+        
+        remaining = timer.getTime()
+        if remaining > 0:
+            core.wait(remaining)
+    
+    def publish(self, event, **fields):
+        """Publish an event to the monitoring feed, if there is one (this only queues the event, see monitor.py)"""
+        if self.monitor is not None:
+            self.monitor.publish(self.subject_id, event, **fields)
+    
+    def prepare_trial_boxes(self, trial):
+        """Pre-render the box screens of a trial ('Trial Start' with the boxes close together, and the boxes apart)
+        
+           Only the area of the boxes and their labels is captured (see boxes_capture_rect), since the captures of a whole
+           block are kept until their trials are run.
+        """
+        label_list = self.draw_ratio_labels(trial.ratio)
+        list_of_box_objects = self.draw_boxes(trial.ratio, trial.box_seed)
+        objects = list_of_box_objects + label_list
+        
+        self.move_boxes(objects, self.box_displacement)
+        together_stim = visual.BufferImageStim(self.win, stim=objects, rect=self.boxes_capture_rect(objects))
+        self.move_boxes(objects, -self.box_displacement)
+        static_stim = visual.BufferImageStim(self.win, stim=objects, rect=self.boxes_capture_rect(objects))
+        
+        self.prepared_boxes[trial] = (together_stim, static_stim)
+    
+    def _warm_text_caches(self):
+        """Draw the text stimuli whose text changes during trials once with all the characters they show, such that the glyphs are cached"""
+        for stim, text in [(self.slider_left_label, '0123456789%'),
+                           (self.slider_right_label, '0123456789%'),
+                           (self.percent_header, 'Percentwise distribution of the 0123456789/8 beads drawn so far:'),
+                           (self.percent_blue_text, 'Blue: 0123456789.%'),
+                           (self.percent_green_text, 'Green: 0123456789.%')]:
+            stim.text = text
+            stim.draw()
+        
+    # -------------------
+    # Generate practice trials
+    # -------------------
+    
+    def generate_practice_trials(self):
+        return generate_practice_trials(self.rng)
+                
+    # -------------------
+    # Run main experiment
+    # -------------------
+    def run_experiment(self):
+         # First, run the 4 practice trials
+        practice_trial_text = visual.TextStim(
+            self.win, 
+            text="Practice trials",
+            color=text_color, height=0.08
+        )
+        practice_trial_text.draw()
+        self.win.flip()
+        core.wait(1.5) 
+       
+        for trial_num in range(len(self.practice_trials)): 
+            self.run_trial(trial_num, practice = True)
+        
+        # Transition from the practice block to the main experiment
+        self.win.flip()
+        core.wait(2.0)
+        transition_text = visual.TextStim(
+            self.win, 
+            text="You've completed the practice trials.\n Please consult the experimenter if you have any questions. \n If not, press any key to begin the main experiment.",
+            color=text_color, height=0.08
+        )
+        transition_text.draw()
+        self.win.flip()
+        event.waitKeys()
+        
+        # In adaptive mode, the trials are chosen one at a time by the adaptive design instead
+        if self.adaptive:
+            self.run_adaptive_trials()
+            return
+        
+        # Begin the main experiment
+        block_structure = BLOCK_ORDER # [60, 90, 60, 90]
+        trials_per_block = 8
+        num_blocks_per_display = len(block_structure) # 4
+        
+        block_counter = 0 # IMPORTANT: Should be 0 for the actual experiment
+        trial_counter = 0 # IMPORTANT: Should be 0 for the actual experiment
+        display_switch_done = False
+        
+        # Iterate over all main trials
+        n_trials = len(self.trials)
+        for trial_num in range(0,n_trials): # IMPORTANT: should be range (n_trials) for the actual experiment
+            self.run_trial(trial_num, practice = False)
+            trial_counter += 1
+            
+            # Check if we've finished the current block
+            if trial_counter == trials_per_block:
+                trial_counter = 0 # Reset for next block
+                block_counter += 1
+            
+                # Determine type of break
+                if block_counter == num_blocks_per_display:
+                    # We're transitioning from 'display = True' to 'display = False'
+                    if not display_switch_done:
+                        self.show_break(duration=60, message = "You've completed the first block. \n The next (and final) block will begin in 1 minute.\n In each of the following trials, the display format of beads drawn will be different. \n A notification will appear on screen when the break is over.",
+                                        next_trials=self.trials[trial_num + 1:trial_num + 1 + trials_per_block])
+                        display_switch_done = True
+                elif block_counter < num_blocks_per_display * 2: # If the block is in between 1 and 8, but not the 5th block (transition)
+                    # Regular 1-minute break between ratio blocks
+                    self.show_break(duration = 60, message="1-minute break.\n A notification will appear on screen when the break is over.",
+                                    next_trials=self.trials[trial_num + 1:trial_num + 1 + trials_per_block])
+                    
+    # -------------------
+    # Run main experiment (adaptive design)
+    # -------------------
+    def run_adaptive_trials(self):
+        """
+        Run each display condition until the adaptive design's stopping rule is met (at most 32 trials each).
+        The posterior is reset between display conditions, so the display contrasts remain estimable.
+        Since the ratios are interleaved (rather than run in blocks of 8 trials), there are no breaks between ratio blocks:
+        the only break is the one between the display conditions.
+        """
+        for display_idx, display_factor in enumerate([True, False]):
+            self.adaptive_design.reset()
+            
+            while not self.adaptive_design.should_stop():
+                ratio, seq_idx = self.adaptive_design.select_next()
+                seq = SEQUENCES[ratio][seq_idx]
+                hidden_color = self.rng.choice(['green', 'blue'])
+                
+                self.trials.append(TrialRecord(hidden_color, display_factor, ratio, seq,
+                                               evidence_asymmetry(seq), box_seed=self.rng.randrange(2**31)))
+                trial = self.trials[-1]
+                self.run_trial(len(self.trials) - 1, practice = False)
+                
+                # Only correct trials inform the posterior (as in the fitting procedure). Ratings are normalized
+                # to the probability of the hidden box (the slider gives the probability of the blue box)
+                if trial.choice == trial.hidden:
+                    estimates = [p if hidden_color == 'blue' else 1 - p for p in trial.prob_estimates]
+                    self.adaptive_design.update(ratio, seq_idx, estimates)
+                else:
+                    self.adaptive_design.update(ratio, seq_idx)
+            
+            if display_idx == 0:
+                self.show_break(duration=60, message = "You've completed the first block. \n The next (and final) block will begin in 1 minute.\n In each of the following trials, the display format of beads drawn will be different. \n A notification will appear on screen when the break is over.")
+                    
+    # -------------------
+    # Save results
+    # -------------------
+    def save_results(self, filename=None):
+        if filename is None:
+            filename = f"beads_task_results_{self.subject_id}.csv"
+        write_results(filename, self.subject_id, self.results)
+        self.save_session(session_filename(filename))
+    
+    def save_session(self, filename):
+        write_session(filename, self.subject_id, self.seed, self.win.size, self.frame_rate, self.realtime.enabled, self.results)
@@ -0,0 +1,140 @@
+"""Trial records and trial generation of the beads task (no PsychoPy needed)"""
+from array import array
+
+from .constants import SEQUENCES, BLOCK_ORDER, COLORS, N_BEADS, WEIGHTS
+
+
+# -------------------
+# Trial records
+# -------------------
+class TrialRecord:
+    """
+    Compact record of one trial (replaces the per-trial dicts, which dominated memory when generating many plans).
+
+    The sequence is stored as a bitmask (bit i = bead i), the colors as indices into COLORS (-1 = no final choice yet),
+    and the 9 probability estimates (prior + one per bead) in one preallocated float array.
+    The old dict representation is available through as_dict().
+    """
+    __slots__ = ('hidden', 'display', 'ratio', 'sequence_mask', 'estimates', 'n_estimates',
+                 'choice', 'evidence_asymmetry', 'missed_frames', 'box_seed', 'gc_pauses', 'priority_raised')
+
+    def __init__(self, hidden_color, display, ratio, sequence, evidence_asymmetry, box_seed=None):
+        self.hidden = COLORS.index(hidden_color)
+        self.display = display
+        self.ratio = ratio
+        self.sequence_mask = sum(bead << i for i, bead in enumerate(sequence))
+        self.estimates = array('d', [float('nan')] * (N_BEADS + 1))
+        self.n_estimates = 0
+        self.choice = -1
+        self.evidence_asymmetry = evidence_asymmetry
+        self.missed_frames = 0
+        self.box_seed = box_seed
+        self.gc_pauses = []  # durations (ms) of the garbage collections during the trial
+        self.priority_raised = False
+
+    @property
+    def hidden_color(self):
+        return COLORS[self.hidden]
+
+    @property
+    def sequence(self):
+        return [(self.sequence_mask >> i) & 1 for i in range(N_BEADS)]
+
+    @property
+    def prob_estimates(self):
+        return self.estimates[:self.n_estimates]
+
+    def add_estimate(self, rating):
+        self.estimates[self.n_estimates] = rating
+        self.n_estimates += 1
+
+    @property
+    def final_choice(self):
+        return COLORS[self.choice] if self.choice >= 0 else None
+
+    @final_choice.setter
+    def final_choice(self, color):
+        self.choice = COLORS.index(color) if color is not None else -1
+
+    def as_dict(self):
+        """The trial in the original dict format"""
+        return {
+            'hidden_color': self.hidden_color,
+            'display': self.display,
+            'ratio': self.ratio,
+            'sequence': self.sequence,
+            'prob_estimates': list(self.prob_estimates),
+            'final_choice': self.final_choice,
+            'evidence_asymmetry': self.evidence_asymmetry,
+            'missed_frames': self.missed_frames,
+            'box_seed': self.box_seed,
+            'gc_pauses': list(self.gc_pauses),
+            'priority_raised': self.priority_raised
+        }
+
+
+# -------------------
+# Trial generation
+# -------------------
+def evidence_asymmetry(sequence):
+    """The evidence asymmetry of a sequence (negative: frontloaded, positive: backloaded)"""
+    return sum(bead * w for bead, w in zip(sequence, WEIGHTS))
+
+
+def generate_trials(rng, display_factors=(True, False)):
+    """The main trials: per display condition, the sequences of each ratio are shuffled and split over the blocks of BLOCK_ORDER
+    
+       All randomness is drawn from rng (a random.Random), in the same order as in a session, such that a session's trials
+       can be regenerated from its seed.
+    """
+    trials = []
+    
+    # IMPORTANT: CHANGE display_factors IN ACCORDANCE WITH THE EXCEL SHEET TRACKING OTHER PARTICIPANT DATA
+    for display_factor in display_factors:
+         # ---- Prepare sequences ----
+        # Make copy of all sequences in the 60 ratio
+        all_seqs_in_60 = SEQUENCES[60][:]
+        mid_60 = len(all_seqs_in_60) // 2
+
+        # Make copy of all sequences in the 90 ratio
+        all_seqs_in_90 = SEQUENCES[90][:]
+        mid_90 = len(all_seqs_in_90) // 2
+        
+        # Shuffle all the sequences in 60 ratio (copy), and split the shuffled list in two (first and last)
+        rng.shuffle(all_seqs_in_60)
+        first_seqs_60 = all_seqs_in_60[:mid_60]
+        last_seqs_60 = all_seqs_in_60[mid_60:]
+        
+        # Shuffle all the sequences in 90 ratio (copy), and split the shuffled list in two (first and last)
+        rng.shuffle(all_seqs_in_90)
+        first_seqs_90 = all_seqs_in_90[:mid_90]
+        last_seqs_90 = all_seqs_in_90[mid_90:]
+        
+        # Create ordered sequence chunks matching BLOCK_ORDER
+        list_of_sequences = [first_seqs_60, first_seqs_90, last_seqs_60, last_seqs_90] #randomize?
+        
+        for block_ratio_idx in range(len(BLOCK_ORDER)):
+            seqs = list_of_sequences[block_ratio_idx][:]
+            block_ratio = BLOCK_ORDER[block_ratio_idx]
+
+            for seq in seqs:
+                hidden_color = rng.choice(['green', 'blue'])
+                trials.append(TrialRecord(hidden_color, display_factor, block_ratio, seq,
+                                          evidence_asymmetry(seq), box_seed=rng.randrange(2**31)))
+    return trials
+
+
+def generate_practice_trials(rng):
+    """The 4 practice trials (one per display condition and ratio), with random sequences"""
+    prac_trials = []
+    
+    for display_factor in [True, False]:
+        for block_ratio in [60,90]:
+            
+            # Pick a random given sequence from the list of sequences belonging to the currently chosen block ratio
+            random_seq = rng.choice(SEQUENCES[block_ratio])
+            hidden_color = rng.choice(['green', 'blue'])
+            
+            prac_trials.append(TrialRecord(hidden_color, display_factor, block_ratio, random_seq,
+                                           evidence_asymmetry(random_seq), box_seed=rng.randrange(2**31)))
+    return prac_trials